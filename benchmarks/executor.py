@@ -0,0 +1,123 @@
+"""
+Measure the time the installer takes to execute a synthetic set of operations.
+
+Usage:
+
+    python benchmarks/executor.py [--packages N] [--seed S] [--runs N]
+
+Poetry has to be importable, e.g. with
+``PYTHONPATH=vendor/poetry/src:vendor/poetry-core/src:...``.
+Downloads and installations are simulated by sleeping, so the numbers only
+reflect how the executor schedules the operations: each package takes
+a random time to download (a few of them are large) and to install,
+and depends on a few packages of a higher depth.
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+from pathlib import Path
+from typing import Any
+from unittest import mock
+
+from cleo.io.buffered_io import BufferedIO
+from poetry.core.packages.dependency import Dependency
+from poetry.core.packages.package import Package
+
+from poetry.config.config import Config
+from poetry.installation.executor import Executor
+from poetry.installation.operations import Install
+from poetry.installation.wheel_installer import WheelInstaller
+from poetry.repositories.repository_pool import RepositoryPool
+from poetry.utils.env import MockEnv
+
+
+def build_operations(count: int, seed: int) -> tuple[list[Install], dict[str, Any]]:
+    rng = random.Random(seed)
+    timings: dict[str, Any] = {}
+    packages: list[tuple[Package, int]] = []
+
+    for i in range(count):
+        depth = rng.choice([0, 1, 1, 2, 2, 3, 4])
+        package = Package(f"package-{i}", "1.0")
+        candidates = [(p, d) for p, d in packages if d > depth]
+        for dependency, _ in rng.sample(candidates, min(len(candidates), 3)):
+            package.add_dependency(Dependency(dependency.name, "*"))
+
+        packages.append((package, depth))
+        large = rng.random() < 0.05
+        timings[package.name] = (
+            rng.uniform(1.0, 2.0) if large else rng.uniform(0.02, 0.3),
+            rng.uniform(0.01, 0.1),
+        )
+
+    operations = [Install(package, priority=depth) for package, depth in packages]
+    operations.sort(key=lambda o: (-o.priority, o.package.name))
+
+    return operations, timings
+
+
+def run(operations: list[Install], timings: dict[str, Any], path: Path) -> float:
+    def download(executor: Executor, operation: Install) -> Path:
+        time.sleep(timings[operation.package.name][0])
+        return path / f"{operation.package.name}.whl"
+
+    def install(
+        installer: WheelInstaller, wheel: Path, use_store: bool = True
+    ) -> None:
+        time.sleep(timings[wheel.stem][1])
+
+    config = Config()
+    config.merge({"installer": {"max-workers": 8, "max-download-workers": 8}})
+    env = MockEnv(path=path)
+    io = BufferedIO()
+    executor = Executor(env, RepositoryPool(), config, io)
+
+    with mock.patch.object(Executor, "_download", download), mock.patch.object(
+        WheelInstaller, "install", install
+    ):
+        start = time.perf_counter()
+        return_code = executor.execute(list(operations))
+        duration = time.perf_counter() - start
+
+    if return_code:
+        sys.exit(f"Executing the operations failed:\n{io.fetch_output()}")
+
+    return duration
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--packages", type=int, default=80)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--runs", type=int, default=3)
+    args = parser.parse_args()
+
+    operations, timings = build_operations(args.packages, args.seed)
+    download_time = sum(download for download, _ in timings.values())
+    install_time = sum(install for _, install in timings.values())
+    print(
+        f"{args.packages} packages,"
+        f" {download_time:.1f}s of downloads, {install_time:.1f}s of installations"
+    )
+
+    with tempfile.TemporaryDirectory() as tmp:
+        durations = [run(operations, timings, Path(tmp)) for _ in range(args.runs)]
+
+    print(
+        f"min {min(durations):.2f}s"
+        f" median {statistics.median(durations):.2f}s"
+        f" max {max(durations):.2f}s"
+    )
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,325 @@
+"""
+Measure the time poetry takes to lock and install a project without the network.
+
+Usage:
+
+    python benchmarks/lock_install.py [--packages N] [--dependencies N] [--seed S]
+        [--runs N] [--index DIR] [--profile DIR]
+
+Poetry has to be importable, e.g. with
+``PYTHONPATH=vendor/poetry/src:vendor/poetry-core/src:...``.
+A fixture index (PEP 503 pages, wheels and their PEP 658 metadata files)
+is served by a local HTTP server, which is the only source of the project.
+The index is generated from the seed, so runs are repeatable: the latest
+versions of the packages depend on other packages with constraints that
+do not always agree, so the solver has to backtrack, while the first
+versions have no dependencies, so the project can always be resolved.
+With ``--index``, the index is written to (or, if it exists, served from)
+the given directory, so it can be kept or replaced by a recorded one.
+
+Every scenario runs ``poetry`` in a new process:
+
+- ``lock (cold)``: ``poetry lock`` with empty caches
+- ``lock (warm)``: ``poetry lock`` again, with the caches of the previous run
+- ``install (cold)``: ``poetry install --no-root`` in a new environment,
+  with empty caches
+- ``install (warm)``: ``poetry install --no-root`` in a new environment,
+  with the artifacts of the previous run
+
+With ``--profile``, each command also writes its profile
+(``poetry --profile``) to the given directory.
+"""
+
+from __future__ import annotations
+
+import argparse
+import base64
+import functools
+import hashlib
+import html
+import json
+import os
+import random
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import zipfile
+
+from http.server import SimpleHTTPRequestHandler
+from http.server import ThreadingHTTPServer
+from pathlib import Path
+from typing import Any
+
+
+VERSIONS = ("1.0.0", "1.1.0", "2.0.0", "2.1.0")
+
+SCENARIOS = ("lock (cold)", "lock (warm)", "install (cold)", "install (warm)")
+
+
+def generate_index(path: Path, packages: int, seed: int) -> list[str]:
+    rng = random.Random(seed)
+    names = [f"package-{i:03}" for i in range(packages)]
+    files = path / "files"
+    files.mkdir(parents=True)
+
+    for i, name in enumerate(names):
+        links = []
+        for version in VERSIONS:
+            requirements = []
+            # Dependencies only point to packages further in the list,
+            # so that the graph has no cycles.
+            candidates = names[i + 1 :]
+            if version != VERSIONS[0] and candidates:
+                for dependency in rng.sample(
+                    candidates, min(len(candidates), rng.randint(1, 4))
+                ):
+                    constraint = rng.choice(
+                        [">=1.0.0", ">=1.1.0,<2.0.0", ">=2.0.0", ">=1.0.0,<3.0.0"]
+                    )
+                    requirements.append(f"{dependency} ({constraint})")
+
+            wheel, metadata = build_wheel(files, name, version, requirements)
+            wheel_hash = hashlib.sha256(wheel.read_bytes()).hexdigest()
+            metadata_hash = hashlib.sha256(metadata).hexdigest()
+            (files / f"{wheel.name}.metadata").write_bytes(metadata)
+            links.append(
+                f'<a href="../../files/{wheel.name}#sha256={wheel_hash}"'
+                f' data-requires-python="{html.escape(">=3.8")}"'
+                f' data-dist-info-metadata="sha256={metadata_hash}">'
+                f"{wheel.name}</a><br/>"
+            )
+
+        write_page(path / "simple" / name / "index.html", links)
+
+    write_page(
+        path / "simple" / "index.html",
+        [f'<a href="{name}/">{name}</a><br/>' for name in names],
+    )
+
+    return names
+
+
+def build_wheel(
+    path: Path, name: str, version: str, requirements: list[str]
+) -> tuple[Path, bytes]:
+    module = name.replace("-", "_")
+    dist_info = f"{module}-{version}.dist-info"
+    wheel = path / f"{module}-{version}-py3-none-any.whl"
+    metadata = "".join(
+        [
+            f"Metadata-Version: 2.1\nName: {name}\nVersion: {version}\n",
+            "Requires-Python: >=3.8\n",
+            *(f"Requires-Dist: {requirement}\n" for requirement in requirements),
+        ]
+    ).encode()
+    records = []
+
+    with zipfile.ZipFile(wheel, "w", compression=zipfile.ZIP_DEFLATED) as zf:
+
+        def add(filename: str, data: bytes) -> None:
+            # A fixed date makes the wheels, and therefore their hashes, repeatable.
+            zf.writestr(zipfile.ZipInfo(filename, (2024, 1, 1, 0, 0, 0)), data)
+            digest = hashlib.sha256(data).digest()
+            hash_ = base64.urlsafe_b64encode(digest).decode().rstrip("=")
+            records.append(f"{filename},sha256={hash_},{len(data)}")
+
+        add(f"{module}/__init__.py", f'__version__ = "{version}"\n'.encode())
+        for i in range(5):
+            source = f"def function_{i}(x):\n    return x + {i}\n" * 20
+            add(f"{module}/module_{i}.py", source.encode())
+
+        add(f"{dist_info}/METADATA", metadata)
+        add(
+            f"{dist_info}/WHEEL",
+            b"Wheel-Version: 1.0\nGenerator: benchmark\n"
+            b"Root-Is-Purelib: true\nTag: py3-none-any\n",
+        )
+        records.append(f"{dist_info}/RECORD,,")
+        zf.writestr(
+            zipfile.ZipInfo(f"{dist_info}/RECORD", (2024, 1, 1, 0, 0, 0)),
+            "\n".join(records) + "\n",
+        )
+
+    return wheel, metadata
+
+
+def write_page(path: Path, links: list[str]) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(
+        "<!DOCTYPE html>\n<html><body>\n" + "\n".join(links) + "\n</body></html>\n",
+        encoding="utf-8",
+    )
+
+
+class IndexServer(ThreadingHTTPServer):
+    """
+    Local stand-in for a package index, serving a fixture directory.
+    """
+
+    def __init__(self, directory: Path) -> None:
+        handler = functools.partial(IndexRequestHandler, directory=str(directory))
+        super().__init__(("127.0.0.1", 0), handler)
+        self.requests = 0
+        self.lock = threading.Lock()
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host!s}:{port}/simple/"
+
+
+class IndexRequestHandler(SimpleHTTPRequestHandler):
+    server: IndexServer
+
+    def log_request(self, code: int | str = "-", size: int | str = "-") -> None:
+        with self.server.lock:
+            self.server.requests += 1
+
+    def log_message(self, format: str, *args: Any) -> None:
+        pass
+
+
+def write_project(path: Path, url: str, names: list[str], dependencies: int) -> None:
+    path.mkdir()
+    requirements = "\n".join(f'{name} = "*"' for name in names[:dependencies])
+    (path / "pyproject.toml").write_text(
+        f"""\
+[tool.poetry]
+name = "benchmark"
+version = "1.0.0"
+description = ""
+authors = []
+
+[tool.poetry.dependencies]
+python = "^3.8"
+{requirements}
+
+[[tool.poetry.source]]
+name = "fixtures"
+url = "{url}"
+priority = "primary"
+""",
+        encoding="utf-8",
+    )
+
+
+def poetry(project: Path, path: Path, args: list[str], profile: Path | None) -> float:
+    env = dict(
+        os.environ,
+        POETRY_CONFIG_DIR=str(path / "config"),
+        POETRY_CACHE_DIR=str(path / "cache"),
+        POETRY_VIRTUALENVS_IN_PROJECT="true",
+    )
+    cmd = [sys.executable, "-m", "poetry", "--no-interaction", "--no-ansi", *args]
+    if profile is not None:
+        cmd += ["--profile", str(profile)]
+
+    start = time.perf_counter()
+    process = subprocess.run(cmd, cwd=project, env=env, capture_output=True, text=True)
+    duration = time.perf_counter() - start
+    if process.returncode:
+        sys.exit(f"{' '.join(args)} failed:\n{process.stdout}{process.stderr}")
+
+    return duration
+
+
+def run(scenario: str, project: Path, path: Path, profile: Path | None) -> float:
+    if scenario.startswith("lock"):
+        (project / "poetry.lock").unlink(missing_ok=True)
+        args = ["lock"]
+    else:
+        shutil.rmtree(project / ".venv", ignore_errors=True)
+        args = ["install", "--no-root"]
+
+    if scenario.endswith("(cold)"):
+        shutil.rmtree(path / "cache", ignore_errors=True)
+
+    return poetry(project, path, args, profile)
+
+
+def describe_profile(profile: Path) -> str:
+    data = json.loads(profile.read_text(encoding="utf-8"))
+    requests = sum(r["requests"] for r in data["http"].values())
+    caches = " ".join(
+        f"{name} {cache['hit_rate']:.0%}" for name, cache in data["caches"].items()
+    )
+    counters = data["counters"]
+    solver = (
+        f"  decisions {counters.get('solver.decisions', 0)}"
+        f" conflicts {counters.get('solver.conflicts', 0)}"
+        if counters
+        else ""
+    )
+    return f"{requests} requests{solver}  cache hits: {caches or '-'}"
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--packages", type=int, default=100)
+    parser.add_argument("--dependencies", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--index", type=Path, help="fixture index directory")
+    parser.add_argument("--profile", type=Path, help="directory of the profiles")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp)
+        index = args.index or path / "index"
+        if (index / "simple").exists():
+            names = sorted(p.name for p in (index / "simple").iterdir() if p.is_dir())
+        else:
+            names = generate_index(index, args.packages, args.seed)
+
+        if args.profile:
+            args.profile.mkdir(parents=True, exist_ok=True)
+
+        server = IndexServer(index)
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+
+        try:
+            project = path / "project"
+            write_project(project, server.url, names, args.dependencies)
+            print(
+                f"{len(names)} packages of {len(VERSIONS)} versions,"
+                f" project with {min(args.dependencies, len(names))} dependencies,"
+                f" served from {server.url}"
+            )
+
+            durations: dict[str, list[float]] = {s: [] for s in SCENARIOS}
+            requests: dict[str, int] = {}
+            profiles: dict[str, Path] = {}
+            for i in range(args.runs):
+                for scenario in SCENARIOS:
+                    profile = None
+                    if args.profile:
+                        name = scenario.replace(" (", "-").rstrip(")")
+                        profile = args.profile / f"{name}-{i}.json"
+                        profiles[scenario] = profile
+
+                    served = server.requests
+                    durations[scenario].append(run(scenario, project, path, profile))
+                    requests[scenario] = server.requests - served
+        finally:
+            server.shutdown()
+            server.server_close()
+
+        for scenario in SCENARIOS:
+            print(
+                f"{scenario:<15} median {statistics.median(durations[scenario]):6.2f}s"
+                f"  min {min(durations[scenario]):6.2f}s"
+                f"  {requests[scenario]:4} requests served"
+            )
+            if scenario in profiles:
+                print(f"{'':<15} {describe_profile(profiles[scenario])}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,283 @@
+"""
+Measure the time and the peak memory the solver takes on marker-heavy projects.
+
+Usage:
+
+    python benchmarks/markers.py [--runs N] [project ...]
+
+Poetry has to be importable, e.g. with
+``PYTHONPATH=vendor/poetry/src:vendor/poetry-core/src:...``.
+The projects use the environment markers of well-known distributions
+(opencv-python, oldest-supported-numpy, pandas, matplotlib, tensorflow, torch)
+and are resolved against in-memory repositories, so the numbers only reflect
+the solver and the marker algebra. Every run happens in a new process,
+so caches start empty.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import resource
+import statistics
+import subprocess
+import sys
+import time
+
+from typing import Any
+
+
+NUMPY_VERSIONS = [
+    "1.13.3",
+    "1.14.5",
+    "1.17.3",
+    "1.19.2",
+    "1.19.3",
+    "1.20.3",
+    "1.21.0",
+    "1.21.2",
+    "1.21.6",
+    "1.22.2",
+    "1.23.2",
+    "1.24.3",
+    "1.26.0",
+]
+
+OLDEST_SUPPORTED_NUMPY = [
+    "numpy==1.19.2; python_version=='3.8' and platform_machine=='aarch64'"
+    " and platform_python_implementation != 'PyPy'",
+    "numpy==1.20.3; python_version=='3.8' and platform_machine=='s390x'"
+    " and platform_python_implementation != 'PyPy'",
+    "numpy==1.21.0; python_version=='3.8' and platform_machine=='arm64'"
+    " and platform_system=='Darwin' and platform_python_implementation != 'PyPy'",
+    "numpy==1.17.3; python_version=='3.8' and platform_machine not in"
+    " 'arm64|aarch64|s390x' and platform_python_implementation != 'PyPy'",
+    "numpy==1.19.3; python_version=='3.9' and platform_machine=='arm64'"
+    " and platform_system=='Windows' and platform_python_implementation != 'PyPy'",
+    "numpy==1.21.0; python_version=='3.9' and platform_machine=='arm64'"
+    " and platform_system=='Darwin' and platform_python_implementation != 'PyPy'",
+    "numpy==1.19.3; python_version=='3.9' and platform_machine not in"
+    " 'arm64|s390x' and platform_python_implementation != 'PyPy'",
+    "numpy==1.21.6; python_version=='3.10' and platform_python_implementation"
+    " != 'PyPy'",
+    "numpy==1.23.2; python_version=='3.11' and platform_python_implementation"
+    " != 'PyPy'",
+    "numpy==1.26.0; python_version=='3.12' and platform_python_implementation"
+    " != 'PyPy'",
+    "numpy==1.22.2; platform_python_implementation=='PyPy'",
+]
+
+OPENCV = [
+    "numpy>=1.13.3; python_version<'3.7'",
+    "numpy>=1.21.2; python_version>='3.10'",
+    "numpy>=1.21.2; python_version>='3.6' and platform_system=='Darwin'"
+    " and platform_machine=='arm64'",
+    "numpy>=1.19.3; python_version>='3.6' and platform_system=='Linux'"
+    " and platform_machine=='aarch64'",
+    "numpy>=1.14.5; python_version>='3.7'",
+    "numpy>=1.17.3; python_version>='3.8'",
+    "numpy>=1.19.3; python_version>='3.9'",
+]
+
+TENSORFLOW = [
+    "tensorflow-intel==2.13.0; platform_system=='Windows'",
+    "tensorflow-cpu-aws==2.13.0; platform_system=='Linux'"
+    " and (platform_machine=='arm64' or platform_machine=='aarch64')",
+    "tensorflow-macos==2.13.0; platform_system=='Darwin'"
+    " and platform_machine=='arm64'",
+    "absl-py>=1.0.0",
+    "numpy<=1.24.3,>=1.22",
+    "tensorflow-io-gcs-filesystem>=0.23.1; platform_machine!='arm64'"
+    " or platform_system!='Darwin'",
+    "typing-extensions<4.6.0,>=3.6.6",
+    "wrapt>=1.11.0",
+]
+
+TORCH = [
+    "filelock",
+    "typing-extensions",
+    "sympy",
+    "networkx",
+    "jinja2",
+    *(
+        f"{name}=={version}; platform_system=='Linux' and platform_machine=='x86_64'"
+        for name, version in [
+            ("nvidia-cuda-nvrtc-cu11", "11.7.99"),
+            ("nvidia-cuda-runtime-cu11", "11.7.99"),
+            ("nvidia-cuda-cupti-cu11", "11.7.101"),
+            ("nvidia-cudnn-cu11", "8.5.0.96"),
+            ("nvidia-cublas-cu11", "11.10.3.66"),
+            ("nvidia-cufft-cu11", "10.9.0.58"),
+            ("nvidia-curand-cu11", "10.2.10.91"),
+            ("nvidia-cusolver-cu11", "11.4.0.1"),
+            ("nvidia-cusparse-cu11", "11.7.4.91"),
+            ("nvidia-nccl-cu11", "2.14.3"),
+            ("nvidia-nvtx-cu11", "11.7.91"),
+            ("triton", "2.0.0"),
+        ]
+    ),
+]
+
+PANDAS = [
+    "numpy>=1.20.3; python_version<'3.10'",
+    "numpy>=1.21.0; python_version>='3.10'",
+    "numpy>=1.23.2; python_version>='3.11'",
+    "python-dateutil>=2.8.2",
+    "pytz>=2020.1",
+    "tzdata>=2022.1",
+]
+
+MATPLOTLIB = [
+    "contourpy>=1.0.1",
+    "cycler>=0.10",
+    "fonttools>=4.22.0",
+    "kiwisolver>=1.0.1",
+    "numpy>=1.20",
+    "packaging>=20.0",
+    "pillow>=6.2.0",
+    "pyparsing>=2.3.1",
+    "python-dateutil>=2.7",
+    "importlib-resources>=3.2.0; python_version<'3.10'",
+]
+
+# project name -> (dependencies of the project, distributions with dependencies)
+PROJECTS: dict[str, tuple[list[str], dict[str, tuple[str, list[str]]]]] = {
+    "opencv": (["opencv-python"], {"opencv-python": ("4.6.0.66", OPENCV)}),
+    "oldest-supported-numpy": (
+        ["oldest-supported-numpy"],
+        {"oldest-supported-numpy": ("2023.8.3", OLDEST_SUPPORTED_NUMPY)},
+    ),
+    "scientific": (
+        [
+            "pandas",
+            "matplotlib",
+            "scipy",
+            "scikit-learn",
+            "opencv-python",
+        ],
+        {
+            "pandas": ("2.0.3", PANDAS),
+            "matplotlib": ("3.7.2", MATPLOTLIB),
+            "scipy": ("1.10.1", ["numpy<1.27.0,>=1.19.5"]),
+            "scikit-learn": (
+                "1.3.0",
+                [
+                    "numpy>=1.17.3",
+                    "scipy>=1.5.0",
+                    "joblib>=1.1.1",
+                    "threadpoolctl>=2.0.0",
+                ],
+            ),
+            "contourpy": ("1.1.0", ["numpy>=1.16"]),
+            "opencv-python": ("4.6.0.66", OPENCV),
+        },
+    ),
+    "machine-learning": (
+        [
+            "tensorflow; sys_platform!='darwin' or platform_machine!='arm64'",
+            "torch",
+            "pandas",
+        ],
+        {
+            "tensorflow": ("2.13.0", TENSORFLOW),
+            "tensorflow-intel": ("2.13.0", TENSORFLOW[3:]),
+            "tensorflow-cpu-aws": ("2.13.0", TENSORFLOW[3:]),
+            "tensorflow-macos": ("2.13.0", TENSORFLOW[3:]),
+            "torch": ("2.0.1", TORCH),
+            "pandas": ("2.0.3", PANDAS),
+            "sympy": ("1.12", ["mpmath>=0.19"]),
+            "jinja2": ("3.1.2", ["MarkupSafe>=2.0"]),
+        },
+    ),
+}
+
+
+def solve(project: str) -> dict[str, float]:
+    from cleo.io.null_io import NullIO
+    from poetry.core.constraints.version import Version
+    from poetry.core.packages.dependency import Dependency
+    from poetry.core.packages.package import Package
+    from poetry.core.packages.project_package import ProjectPackage
+
+    from poetry.puzzle import Solver
+    from poetry.repositories import Repository
+    from poetry.repositories import RepositoryPool
+
+    requirements, distributions = PROJECTS[project]
+    repository = Repository("benchmark")
+    versions: dict[str, set[str]] = {}
+    for _, dependencies in distributions.values():
+        for requirement in dependencies:
+            dependency = Dependency.create_from_pep_508(requirement)
+            if dependency.name in distributions:
+                continue
+
+            # Leaves are available in the pinned versions and in a few others.
+            leaf_versions = versions.setdefault(
+                dependency.name, {"1.0", "2.0", "4.5.0", "20.0", "2023.3"}
+            )
+            if dependency.name == "numpy":
+                leaf_versions.update(NUMPY_VERSIONS)
+            if isinstance(dependency.constraint, Version):
+                leaf_versions.add(dependency.constraint.text)
+
+    for name, (version, dependencies) in distributions.items():
+        package = Package(name, version)
+        for requirement in dependencies:
+            package.add_dependency(Dependency.create_from_pep_508(requirement))
+        repository.add_package(package)
+
+    for name, leaf_versions in versions.items():
+        for version in leaf_versions:
+            repository.add_package(Package(name, version))
+
+    root = ProjectPackage("root", "1.0")
+    root.python_versions = ">=3.8,<3.13"
+    for requirement in requirements:
+        root.add_dependency(Dependency.create_from_pep_508(requirement))
+
+    solver = Solver(root, RepositoryPool([repository]), [], [], NullIO())
+
+    start = time.perf_counter()
+    packages = solver.solve().calculate_operations()
+    duration = time.perf_counter() - start
+
+    # ru_maxrss is in kilobytes, except on macOS where it is in bytes.
+    unit = 1 if sys.platform == "darwin" else 1024
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * unit
+
+    return {"time": duration, "rss": rss, "packages": len(packages)}
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--child", help=argparse.SUPPRESS)
+    parser.add_argument("projects", nargs="*", default=list(PROJECTS))
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(solve(args.child)))
+        return 0
+
+    for project in args.projects:
+        results: list[dict[str, Any]] = []
+        for _ in range(args.runs):
+            output = subprocess.check_output(
+                [sys.executable, __file__, "--child", project], text=True
+            )
+            results.append(json.loads(output.splitlines()[-1]))
+
+        durations = [result["time"] for result in results]
+        print(
+            f"{project:<24} {results[0]['packages']:3} packages"
+            f"  median {statistics.median(durations):6.3f}s"
+            f"  min {min(durations):6.3f}s"
+            f"  peak RSS {max(r['rss'] for r in results) / 2**20:6.1f} MB"
+        )
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,123 @@
+"""
+Measure the time to the first output of common poetry commands.
+
+Their total time, until they exit, is reported as well.
+
+Usage:
+
+    python benchmarks/startup.py [--runs N] [poetry command]
+
+The poetry command defaults to ``poetry`` and can be any command line,
+e.g. ``build/x86_64-unknown-linux-gnu/release/install/poetry`` or
+``python -m poetry`` to measure a source checkout.
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import shlex
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+from pathlib import Path
+
+
+PYPROJECT = """\
+[tool.poetry]
+name = "startup-benchmark"
+version = "0.1.0"
+description = ""
+authors = ["Poetry <poetry@example.com>"]
+packages = []
+
+[tool.poetry.dependencies]
+python = "^3.8"
+
+[build-system]
+requires = ["poetry-core>=1.0.0"]
+build-backend = "poetry.core.masonry.api"
+"""
+
+COMMANDS = [
+    ["--version"],
+    ["run", "true"],
+    ["check"],
+]
+
+
+def measure(
+    cmd: list[str], cwd: Path, env: dict[str, str], runs: int
+) -> tuple[list[float], list[float]]:
+    """
+    Return the times to the first output and the total times of the runs.
+
+    Commands that do not write anything, like ``poetry run true``,
+    have their first output when they exit.
+    """
+    first_outputs = []
+    totals = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        with subprocess.Popen(cmd, cwd=cwd, env=env, stdout=subprocess.PIPE) as p:
+            assert p.stdout is not None
+            first_output = None
+            if p.stdout.read(1):
+                first_output = time.perf_counter() - start
+            p.stdout.read()
+        total = time.perf_counter() - start
+        if p.returncode:
+            raise subprocess.CalledProcessError(p.returncode, cmd)
+
+        first_outputs.append(total if first_output is None else first_output)
+        totals.append(total)
+    return first_outputs, totals
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("poetry", nargs=argparse.REMAINDER)
+    args = parser.parse_args()
+    args.poetry = args.poetry or ["poetry"]
+
+    env = dict(os.environ, POETRY_VIRTUALENVS_IN_PROJECT="true")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        project = Path(tmp)
+        project.joinpath("pyproject.toml").write_text(PYPROJECT)
+        # Create the project environment upfront, it is not part of the startup.
+        subprocess.run(
+            [*args.poetry, "env", "use", sys.executable],
+            cwd=project,
+            env=env,
+            check=True,
+            stdout=subprocess.DEVNULL,
+        )
+
+        print(
+            f"{'':<24} {'first output':^26} {'total':^17}\n"
+            f"{'command':<24} {'min':>8} {'median':>8} {'max':>8}"
+            f" {'min':>8} {'median':>8}"
+        )
+        for command in COMMANDS:
+            cmd = [*args.poetry, *command]
+            measure(cmd, project, env, 1)
+            first_outputs, totals = measure(cmd, project, env, args.runs)
+            print(
+                f"{shlex.join(['poetry', *command]):<24}"
+                f" {min(first_outputs) * 1000:>6.0f}ms"
+                f" {statistics.median(first_outputs) * 1000:>6.0f}ms"
+                f" {max(first_outputs) * 1000:>6.0f}ms"
+                f" {min(totals) * 1000:>6.0f}ms"
+                f" {statistics.median(totals) * 1000:>6.0f}ms"
+            )
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,205 @@
+"""
+Measure the peak memory and the time it takes to install a large wheel.
+
+Usage:
+
+    python benchmarks/wheel_install.py [--size MB] [--modules N] [--compile]
+
+Poetry has to be importable, e.g. with
+``PYTHONPATH=vendor/poetry/src:vendor/poetry-core/src:...``.
+A synthetic wheel with a few large data files and many small modules is
+installed in a fresh directory, once per mode, each in its own process:
+
+- ``unvalidated``: contents are not checked against RECORD
+- ``in-memory``: contents are checked before the installation,
+  by ``WheelFile.validate_record(validate_contents=True)``
+- ``streaming``: contents are checked while they are installed,
+  the way poetry installs wheels
+
+With ``--compile``, the first two modes compile bytecode file by file
+while installing, while ``streaming`` compiles it in a single batch
+at the end, on a pool of processes.
+"""
+
+from __future__ import annotations
+
+import argparse
+import base64
+import hashlib
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+import zipfile
+
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+    from collections.abc import Iterator
+
+
+MODES = ("unvalidated", "in-memory", "streaming")
+
+DIST_INFO = "bigwheel-1.0.dist-info"
+
+
+def build_wheel(path: Path, size: int, modules: int) -> Path:
+    wheel = path / "bigwheel-1.0-py3-none-any.whl"
+    records = []
+    chunk = 1024 * 1024
+
+    with zipfile.ZipFile(wheel, "w", compression=zipfile.ZIP_DEFLATED) as zf:
+
+        def add(name: str, chunks: Iterable[bytes] = (), **kw: int) -> None:
+            hash_ = hashlib.sha256()
+            length = 0
+            with zf.open(name, "w", force_zip64=True) as f:
+                for data in chunks if not kw else _random_chunks(**kw):
+                    hash_.update(data)
+                    length += len(data)
+                    f.write(data)
+
+            digest = base64.urlsafe_b64encode(hash_.digest()).decode().rstrip("=")
+            records.append(f"{name},sha256={digest},{length}")
+
+        for i in range(modules):
+            source = f"def function_{i}(x):\n    return x + {i}\n" * 50
+            add(f"bigwheel/module_{i}.py", [source.encode()])
+
+        # Random data does not compress, so the wheel is about as large as
+        # its contents. Files are large enough to exhaust memory if read at once.
+        for i, remaining in enumerate(_split(size * chunk, 4)):
+            add(f"bigwheel/data/blob_{i}.bin", total=remaining, chunk=chunk)
+
+        add(
+            f"{DIST_INFO}/METADATA",
+            [b"Metadata-Version: 2.1\nName: bigwheel\nVersion: 1.0\n"],
+        )
+        add(
+            f"{DIST_INFO}/WHEEL",
+            [
+                b"Wheel-Version: 1.0\nGenerator: benchmark\n"
+                b"Root-Is-Purelib: true\nTag: py3-none-any\n"
+            ],
+        )
+        records.append(f"{DIST_INFO}/RECORD,,")
+        zf.writestr(f"{DIST_INFO}/RECORD", "\n".join(records) + "\n")
+
+    return wheel
+
+
+def _split(total: int, parts: int) -> list[int]:
+    return [total // parts + (i < total % parts) for i in range(parts)]
+
+
+def _random_chunks(total: int, chunk: int) -> Iterator[bytes]:
+    while total > 0:
+        yield os.urandom(min(chunk, total))
+        total -= chunk
+
+
+def install(mode: str, wheel: Path, target: Path, compile: bool) -> None:
+    from installer import install
+    from installer.sources import WheelFile
+
+    from poetry.__version__ import __version__
+    from poetry.installation.wheel_installer import WheelDestination
+    from poetry.installation.wheel_installer import WheelInstaller
+    from poetry.utils.env import MockEnv
+
+    env = MockEnv(path=target, execute=True)
+
+    if mode == "streaming":
+        installer = WheelInstaller(env)
+        installer.enable_bytecode_compilation(compile)
+        installer.install(wheel)
+        installer.compile_bytecode()
+        assert not installer.invalid_wheels, installer.invalid_wheels
+        return
+
+    with WheelFile.open(wheel) as source:
+        source.validate_record(validate_contents=mode == "in-memory")
+        paths = env.paths
+        destination = WheelDestination(
+            {
+                "headers": paths["include"],
+                "purelib": paths["purelib"],
+                "platlib": paths["platlib"],
+                "scripts": paths["scripts"],
+                "data": paths["data"],
+            },
+            interpreter=str(env.python),
+            script_kind="posix",
+            bytecode_optimization_levels=(-1,) if compile else (),
+        )
+        install(
+            source=source,
+            destination=destination,
+            additional_metadata={"INSTALLER": f"Poetry {__version__}".encode()},
+        )
+
+
+def run_child(mode: str, wheel: Path, target: Path, compile: bool) -> None:
+    start = time.perf_counter()
+    install(mode, wheel, target, compile)
+    duration = time.perf_counter() - start
+
+    # ru_maxrss is in kilobytes, except on macOS where it is in bytes.
+    unit = 1 if sys.platform == "darwin" else 1024
+    rss = max(
+        resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+        resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss,
+    )
+    print(json.dumps({"time": duration, "rss": rss * unit}))
+
+
+def measure(mode: str, wheel: Path, path: Path, compile: bool) -> dict[str, float]:
+    with tempfile.TemporaryDirectory(dir=path) as target:
+        cmd = [sys.executable, __file__, "--child", mode, str(wheel), target]
+        if compile:
+            cmd.append("--compile")
+        output = subprocess.check_output(cmd, text=True)
+
+    result: dict[str, float] = json.loads(output.splitlines()[-1])
+    return result
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--size", type=int, default=200, help="size of the data (MB)")
+    parser.add_argument("--modules", type=int, default=2000)
+    parser.add_argument("--compile", action="store_true")
+    parser.add_argument("--child", nargs=3, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        mode, wheel, target = args.child
+        run_child(mode, Path(wheel), Path(target), args.compile)
+        return 0
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp)
+        wheel = build_wheel(path, args.size, args.modules)
+        print(
+            f"{wheel.name}: {wheel.stat().st_size / 2**20:.0f} MB,"
+            f" {args.modules} modules, bytecode compilation: {args.compile}"
+        )
+
+        for mode in MODES:
+            result = measure(mode, wheel, path, args.compile)
+            print(
+                f"{mode:<12} {result['time']:6.2f}s"
+                f" peak RSS {result['rss'] / 2**20:7.1f} MB"
+            )
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
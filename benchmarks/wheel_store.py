@@ -0,0 +1,144 @@
+"""
+Measure the time and the disk space it takes to install wheels in many environments.
+
+Usage:
+
+    python benchmarks/wheel_store.py [--packages N] [--modules N] [--envs N]
+
+Poetry has to be importable, e.g. with
+``PYTHONPATH=vendor/poetry/src:vendor/poetry-core/src:...``.
+Synthetic wheels are installed in several fresh environments, once per mode:
+
+- ``copy``: files are extracted from the wheels in every environment
+- ``store``: wheels are unpacked once in the wheel store
+  (``installer.wheel-store``) and their files are linked into the environments
+
+The disk space counts every file once, even if it is linked
+in several places, including the files of the wheel store.
+"""
+
+from __future__ import annotations
+
+import argparse
+import base64
+import hashlib
+import os
+import sys
+import tempfile
+import time
+import zipfile
+
+from pathlib import Path
+
+
+def build_wheel(path: Path, index: int, modules: int) -> Path:
+    name = f"package_{index}"
+    dist_info = f"{name}-1.0.dist-info"
+    wheel = path / f"{name}-1.0-py3-none-any.whl"
+    records = []
+
+    with zipfile.ZipFile(wheel, "w", compression=zipfile.ZIP_DEFLATED) as zf:
+
+        def add(filename: str, data: bytes) -> None:
+            zf.writestr(filename, data)
+            digest = hashlib.sha256(data).digest()
+            hash_ = base64.urlsafe_b64encode(digest).decode().rstrip("=")
+            records.append(f"{filename},sha256={hash_},{len(data)}")
+
+        add(f"{name}/__init__.py", b"")
+        for i in range(modules):
+            source = f"def function_{i}(x):\n    return x + {index}\n" * 100
+            add(f"{name}/module_{i}.py", source.encode())
+
+        add(
+            f"{dist_info}/METADATA",
+            f"Metadata-Version: 2.1\nName: {name}\nVersion: 1.0\n".encode(),
+        )
+        add(
+            f"{dist_info}/WHEEL",
+            b"Wheel-Version: 1.0\nGenerator: benchmark\n"
+            b"Root-Is-Purelib: true\nTag: py3-none-any\n",
+        )
+        add(
+            f"{dist_info}/entry_points.txt",
+            f"[console_scripts]\n{name} = {name}.module_0:function_0\n".encode(),
+        )
+        records.append(f"{dist_info}/RECORD,,")
+        zf.writestr(f"{dist_info}/RECORD", "\n".join(records) + "\n")
+
+    return wheel
+
+
+def disk_usage(*paths: Path) -> int:
+    inodes = set()
+    usage = 0
+    for path in paths:
+        for root, _, files in os.walk(path):
+            for file in files:
+                stat = os.lstat(os.path.join(root, file))
+                if (stat.st_dev, stat.st_ino) in inodes:
+                    continue
+
+                inodes.add((stat.st_dev, stat.st_ino))
+                usage += stat.st_blocks * 512
+
+    return usage
+
+
+def measure(
+    mode: str, wheels: list[Path], path: Path, envs: int
+) -> tuple[list[float], int]:
+    from poetry.installation.wheel_installer import WheelInstaller
+    from poetry.installation.wheel_installer import WheelStore
+    from poetry.utils.env import MockEnv
+
+    store_path = path / "store"
+    store = WheelStore(store_path) if mode == "store" else None
+    env_paths = [path / f"env_{i}" for i in range(envs)]
+
+    durations = []
+    for env_path in env_paths:
+        installer = WheelInstaller(MockEnv(path=env_path), store=store)
+        start = time.perf_counter()
+        for wheel in wheels:
+            installer.install(wheel)
+        durations.append(time.perf_counter() - start)
+        assert not installer.invalid_wheels, installer.invalid_wheels
+
+    return durations, disk_usage(store_path, *env_paths)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--packages", type=int, default=400)
+    parser.add_argument("--modules", type=int, default=20)
+    parser.add_argument("--envs", type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp)
+        (path / "wheels").mkdir()
+        wheels = [
+            build_wheel(path / "wheels", i, args.modules) for i in range(args.packages)
+        ]
+        print(
+            f"{args.packages} wheels of {args.modules} modules,"
+            f" installed in {args.envs} environments"
+        )
+
+        for mode in ("copy", "store"):
+            mode_path = path / mode
+            mode_path.mkdir()
+            durations, usage = measure(mode, wheels, mode_path, args.envs)
+            others = durations[1:] or durations
+            print(
+                f"{mode:<6} first environment {durations[0]:6.2f}s"
+                f"  next ones {sum(others) / len(others):6.2f}s on average"
+                f"  disk {usage / 2**20:7.1f} MB"
+            )
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())